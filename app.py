@@ -1,11 +1,18 @@
+import atexit
+import os
 from flask import Flask, request, render_template, redirect, url_for
 from database import SimpleRDBMS
 
 # Create Flask app
 app = Flask(__name__)
 
-# Create database instance (loads saved data if available)
-db = SimpleRDBMS()
+# Create database instance (loads saved data if available).
+# Bursts of writes are grouped: the log is written every 32 changes
+# or 50 ms after the first unwritten one, whichever comes first.
+db = SimpleRDBMS(flush_every=32, flush_interval=0.05)
+
+# Write anything still buffered when the server stops
+atexit.register(db.close)
 
 # Create the todos table if it does not exist
 if 'todos' not in db.tables:
@@ -21,8 +28,8 @@ def index():
     if request.method == 'POST':
         task = request.form.get('task')
         if task:
-            # Generate next ID
-            next_id = len(db.select('todos')) + 1
+            # Generate next ID from the largest existing one (no row copies)
+            next_id = (db.max_pk('todos') or 0) + 1
             db.insert('todos', {'id': next_id, 'task': task})
 
     # Get all todos
@@ -51,4 +58,8 @@ def delete(id):
 
 # Run the app
 if __name__ == '__main__':
+    if os.environ.get('WERKZEUG_RUN_MAIN') != 'true':
+        # This is the debug reloader's parent, which only restarts the server
+        # process; that child owns the database, so this copy must not save it
+        atexit.unregister(db.close)
     app.run(debug=True)
@@ -1,54 +1,511 @@
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
 from datetime import date
+from itertools import repeat
+import contextlib
+import functools
 import json
+import mmap
+import operator
+import os
+import threading
+
+try:
+    import orjson            # Optional: much faster JSON encoding/decoding in C
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np       # Optional: int columns are scanned in C
+except ImportError:
+    np = None
+
+
+def _json_default(value):
+    # Dates are stored as ISO strings and turned back into dates on load/replay
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, IntColumn):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    def _dumps(obj, pretty=False):
+        # orjson writes dates as ISO strings natively
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        return orjson.dumps(obj, default=_json_default, option=option)
+
+    _loads = orjson.loads    # Also takes a memoryview, so mapped files parse without a copy
+else:
+    def _dumps(obj, pretty=False):
+        if pretty:
+            text = json.dumps(obj, indent=2, default=_json_default)
+        else:
+            text = json.dumps(obj, separators=(',', ':'), default=_json_default)
+        return text.encode()
+
+    def _loads(data):
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+@contextlib.contextmanager
+def _mapped(path):
+    """
+    Map a file read-only and yield it (b'' when empty, which mmap cannot map),
+    so it can be searched and parsed in place instead of read() into a copy.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+# WHERE operators -> the test generated for them; c is the column, w the wanted value.
+# Range tests skip None (missing) values, which cannot be ordered.
+_OP_TESTS = {
+    '=': 'c{n}[i] == w{n}',
+    '<': 'c{n}[i] is not None and c{n}[i] < w{n}',
+    '<=': 'c{n}[i] is not None and c{n}[i] <= w{n}',
+    '>': 'c{n}[i] is not None and c{n}[i] > w{n}',
+    '>=': 'c{n}[i] is not None and c{n}[i] >= w{n}',
+    'BETWEEN': 'c{n}[i] is not None and w{n}[0] <= c{n}[i] <= w{n}[1]',
+}
+
+
+def _make_coercer(col, dtype):
+    """Return the function that converts a value for a column of this type."""
+    if dtype == 'int':
+        if np is None and orjson is None:
+            return int
+
+        def to_int64(val):
+            # Int columns are numpy int64 arrays and orjson only writes 64-bit ints,
+            # so values must fit in 64 bits
+            val = int(val)
+            if not IntColumn.NULL < val < (1 << 63):
+                raise ValueError(f"{col} is out of range for an int column")
+            return val
+        return to_int64
+    if dtype == 'str':
+        return str
+    if dtype == 'date':
+        def to_date(val):
+            if isinstance(val, str):
+                return date.fromisoformat(val)
+            if not isinstance(val, date):
+                raise ValueError(f"{col} must be a date")
+            return val
+        return to_date
+    return lambda val: val      # Unknown types are stored as given
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_filter(ops):
+    """
+    Generate, once per combination of WHERE operators, a function that keeps
+    the positions whose column values pass every condition, e.g. for ('=', '>'):
+
+        def _filter(positions, c0, c1, w0, w1):
+            return [i for i in positions if (c0[i] == w0) and (c1[i] is not None and c1[i] > w1)]
+
+    Only generated names and the fixed tests above appear in the source;
+    column names and values are passed in as arguments.
+    """
+    arity = len(ops)
+    cols = ', '.join(f'c{n}' for n in range(arity))
+    wanted = ', '.join(f'w{n}' for n in range(arity))
+    test = ' and '.join('(' + _OP_TESTS[op].format(n=n) + ')' for n, op in enumerate(ops))
+    src = (f"def _filter(positions, {cols}, {wanted}):\n"
+           f"    return [i for i in positions if {test}]\n")
+    namespace = {}
+    exec(src, namespace)
+    return namespace['_filter']
+
+
+def _locked(method):
+    """
+    Run a mutator under the database lock, so its checks, the table change
+    and its log line happen as one step with respect to other threads.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class IntColumn:
+    """
+    An int column held in a numpy int64 array that doubles in size as it fills.
+    Supports the list operations the tables use (append, item get/set,
+    whole-column slice assignment, len, iteration) so it can stand in for a
+    list, and array() exposes the values for vectorized comparisons.
+    Missing values are stored as NULL and read back as None.
+    """
+    __slots__ = ('_data', '_size')
+    NULL = -(1 << 63)
+    SHORT_TAKE = 32     # take() gathers this many positions or fewer without numpy
+
+    def __init__(self, values=()):
+        self._data = np.empty(8, dtype=np.int64)
+        self._size = 0
+        self[:] = values
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, i):
+        if not 0 <= i < self._size:
+            if not -self._size <= i < 0:
+                raise IndexError("column index out of range")
+            i += self._size
+        # item() returns a Python int directly, without a numpy scalar in between
+        val = self._data.item(i)
+        return None if val == self.NULL else val
+
+    def __setitem__(self, i, value):
+        if isinstance(i, slice):
+            # Only whole-column replacement is needed (load and vacuum)
+            values = [self.NULL if v is None else v for v in value]
+            self._size = len(values)
+            self._data = np.empty(max(8, self._size), dtype=np.int64)
+            self._data[:self._size] = values
+            return
+        if not -self._size <= i < self._size:
+            raise IndexError("column index out of range")
+        self._data[i % self._size] = self.NULL if value is None else value
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def append(self, value):
+        if self._size == len(self._data):
+            grown = np.empty(2 * self._size, dtype=np.int64)
+            grown[:self._size] = self._data
+            self._data = grown
+        self._data[self._size] = self.NULL if value is None else value
+        self._size += 1
+
+    def array(self):
+        """The stored values (NULL for missing) as a numpy view."""
+        return self._data[:self._size]
+
+    def take(self, positions):
+        """Values at the given positions as a list, gathered in one numpy call."""
+        if len(positions) <= self.SHORT_TAKE:
+            # A numpy gather has a fixed cost that outweighs a few item() calls
+            values = list(map(self._data.item, positions))
+            if self.NULL in values:
+                values = [None if v == self.NULL else v for v in values]
+            return values
+        return self._to_list(self._data[positions])
+
+    def tolist(self):
+        return self._to_list(self.array())
+
+    def _to_list(self, arr):
+        values = arr.tolist()
+        if (arr == self.NULL).any():
+            values = [None if v == self.NULL else v for v in values]
+        return values
+
+
+def _take(values, positions):
+    """Values of a column (list or IntColumn) at the given positions."""
+    if isinstance(values, IntColumn):
+        return values.take(positions)
+    return [values[i] for i in positions]
+
+
+def _filter_column(values, positions):
+    """
+    Column data for the generated filter, which reads c[i] for each position.
+    An IntColumn would run Python code on every read, so the checked
+    positions are gathered at once into a position -> value dict.
+    """
+    if isinstance(values, IntColumn):
+        return dict(zip(positions, values.take(positions)))
+    return values
+
+
+def _fits_int64(value):
+    return type(value) is int and IntColumn.NULL < value < (1 << 63)
+
+
+# Vectorized versions of the WHERE operators, used on IntColumn arrays
+_ARRAY_OPS = {
+    '=': operator.eq,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+
+class RowView(Mapping):
+    """
+    Read-only row returned by select() and join().
+    Holds the row's values as a tuple and shares one column -> position
+    map with every other row of the same result, instead of a dict per row.
+    """
+    __slots__ = ('_vals', '_index')
+
+    def __init__(self, vals, index):
+        self._vals = vals
+        self._index = index
+
+    def __getitem__(self, key):
+        return self._vals[self._index[key]]
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class Table:
+    """
+    One table: its schema, its rows stored column by column, and its indexes.
+    """
+    __slots__ = ('columns', 'cols', 'primary_key', 'uniques', 'indexes', 'sorted_indexes',
+                 '_index', '_date_cols', '_coercers', '_max_pk', '_dead')
+
+    def __init__(self, columns, cols, primary_key, uniques):
+        self.columns = columns
+        # Columnar storage: one list per column, row i is position i in every list
+        self.cols = cols
+        self.primary_key = primary_key
+        self.uniques = uniques
+        self.indexes = {}
+        self.sorted_indexes = {}
+
+        # Per-schema lookups derived once here instead of on every save/load/select
+        # Column name -> position in a row tuple, shared by every RowView of the table
+        self._index = {name: i for i, (name, _) in enumerate(columns)}
+        self._date_cols = [name for name, dtype in columns if dtype == 'date']
+        self._coercers = {name: _make_coercer(name, dtype) for name, dtype in columns}
+        self._max_pk = None        # Largest PK, worked out lazily by SimpleRDBMS.max_pk()
+        self._dead = set()         # Positions of deleted rows (tombstones)
+
+        # With numpy installed, int columns live in numpy arrays
+        if np is not None:
+            for name, dtype in columns:
+                if dtype == 'int':
+                    self.cols[name] = IntColumn(self.cols[name])
+
 
 class SimpleRDBMS:
-    def __init__(self, db_file='database.json'):
+    __slots__ = ('tables', 'db_file', 'wal_file', 'flush_every', 'flush_interval',
+                 '_wal_fd', '_wal_size', '_lsn', '_pending', '_lock', '_timer', '_replaying')
+
+    # Rewrite the snapshot and truncate the log once the log grows past this size
+    WAL_COMPACT_BYTES = 1 << 20
+
+    def __init__(self, db_file='database.json', flush_every=1, flush_interval=None):
+        """
+        `flush_every` groups that many logged mutations into one write (group commit);
+        `flush_interval` (seconds) flushes a partial group after that long.
+        The default writes every mutation straight away. With grouping, a crash
+        can lose the mutations that were still waiting in the buffer.
+        """
         self.tables = {}
         self.db_file = db_file
+        self.wal_file = db_file + '.wal'
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._wal_fd = None
+        self._replaying = True  # Replayed mutations are not logged a second time
+        self._lsn = 0        # Sequence number of the last applied mutation
+        self._pending = []   # Encoded log lines not yet written
+        self._lock = threading.RLock()
+        self._timer = None
         self._load_from_file()
+        self._replaying = False
+        # One long-lived append-only descriptor; os.write needs no Python-level buffer
+        self._wal_fd = os.open(self.wal_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._wal_size = os.fstat(self._wal_fd).st_size
+
+    def close(self):
+        """Fold the write-ahead log into the snapshot and close it."""
+        with self._lock:
+            if self._wal_fd is not None:
+                self.flush()
+                # Only compact a log this instance wrote all of; if another instance
+                # appended to it or compacted it, this one's tables are stale
+                if self._wal_size and os.fstat(self._wal_fd).st_size == self._wal_size:
+                    self.compact()
+                os.close(self._wal_fd)
+                self._wal_fd = None
+
+    def flush(self):
+        """Write every buffered log line in a single write call."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._pending and self._wal_fd is not None:
+                data = memoryview(b''.join(self._pending))
+                while data:
+                    data = data[os.write(self._wal_fd, data):]
+                self._pending.clear()
 
     # ---------------- Persistence ----------------
     def _load_from_file(self):
+        """
+        Load the last snapshot, then replay the write-ahead log on top of it.
+        """
         try:
-            with open(self.db_file, 'r') as f:
-                data = json.load(f)
-                self.tables = data.get('tables', {})
+            with _mapped(self.db_file) as mapped:
+                data = _loads(memoryview(mapped))
+                self._lsn = data.get('lsn', 0)
+
+                for table_name, saved in data.get('tables', {}).items():
+                    columns = saved['columns']
+                    cols = saved.get('cols')
+                    # Older snapshots stored each table as a list of row dicts
+                    if cols is None:
+                        rows = saved.get('rows', [])
+                        cols = {name: [row.get(name) for row in rows] for name, _ in columns}
+                    table = Table(columns, cols, saved['primary_key'], saved.get('uniques', []))
+                    self.tables[table_name] = table
 
-                # Convert date strings back to date objects
-                for table_name, table in self.tables.items():
-                    for row in table['rows']:
-                        for col_name, col_type in table['columns']:
-                            if col_type == 'date' and col_name in row and isinstance(row[col_name], str):
-                                row[col_name] = date.fromisoformat(row[col_name])
+                    # Convert date strings back to date objects, touching only date columns
+                    for col_name in table._date_cols:
+                        table.cols[col_name] = [
+                            date.fromisoformat(v) if isinstance(v, str) else v
+                            for v in table.cols[col_name]
+                        ]
 
                     # Rebuild indexes
-                    table['indexes'] = {}
-                    for col in [table['primary_key']] + table.get('uniques', []):
+                    for col in [table.primary_key] + table.uniques:
                         self.create_index(table_name, col)
         except FileNotFoundError:
             pass
         except json.JSONDecodeError:
             raise ValueError("Database file is corrupted")
+        self._replay_wal()
+
+    def _replay_wal(self):
+        snapshot_lsn = self._lsn
+        try:
+            with _mapped(self.wal_file) as mapped:
+                size = len(mapped)
+                start = 0      # Offset just past the last complete line
+                while True:
+                    end = mapped.find(b'\n', start)
+                    if end == -1:
+                        break  # End of log, or a torn write from a crash that never completed
+                    try:
+                        record = _loads(memoryview(mapped)[start:end])
+                    except json.JSONDecodeError:
+                        raise ValueError("Write-ahead log is corrupted") from None
+                    start = end + 1
+                    # Records older than the snapshot are already in it
+                    if record['lsn'] > snapshot_lsn:
+                        self._apply(record)
+                        self._lsn = record['lsn']
+        except FileNotFoundError:
+            return
+        if start < size:
+            # Cut off the torn tail, or the next append would be glued onto it
+            os.truncate(self.wal_file, start)
+
+    def _apply(self, record):
+        op = record['op']
+        if op == 'create':
+            self.create_table(record['table'], record['columns'],
+                              record['primary_key'], record['uniques'])
+        elif op == 'insert':
+            self.insert(record['table'], record['row'])
+        elif op == 'update':
+            self.update(record['table'], record['where'], record['updates'])
+        elif op == 'delete':
+            self.delete(record['table'], record['where'])
+        else:
+            raise ValueError(f"Unknown log record: {op}")
+
+    def _encode(self, op, table_name, **fields):
+        """
+        Encode one mutation as a log line before it is applied, so a value
+        that cannot be serialized is rejected while the tables are unchanged.
+        """
+        if self._replaying:
+            return None
+        if self._wal_fd is None:
+            raise ValueError("Database is closed")
+        with self._lock:
+            record = {'lsn': self._lsn + 1, 'op': op, 'table': table_name, **fields}
+            line = _dumps(record) + b'\n'
+            self._lsn += 1
+            return line
+
+    def _log(self, line):
+        """
+        Append one encoded mutation to the write-ahead log as a single JSON line.
+        Each write costs O(1) bytes instead of rewriting every table.
+        """
+        if line is None:
+            return
+        with self._lock:
+            self._pending.append(line)
+            self._wal_size += len(line)
+            if self._wal_size > self.WAL_COMPACT_BYTES:
+                self.compact()
+            elif len(self._pending) >= self.flush_every:
+                self.flush()
+            elif self.flush_interval is not None and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def compact(self, pretty=False):
+        """
+        Write a full snapshot of every table and truncate the write-ahead log.
+        `pretty=True` indents the snapshot for reading by hand.
+        """
+        with self._lock:
+            self._save_to_file(pretty)
+            # Buffered lines are already part of the snapshot, so they are dropped
+            self._pending.clear()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._wal_fd is not None:
+                os.ftruncate(self._wal_fd, 0)
+                self._wal_size = 0
 
-    def _save_to_file(self):
+    def _save_to_file(self, pretty=False):
         serializable_tables = {}
         for table_name, table in self.tables.items():
-            table_copy = {k: v for k, v in table.items() if k != 'indexes'}
-            table_copy['rows'] = []
-            for row in table['rows']:
-                new_row = {}
-                for col_name, value in row.items():
-                    if isinstance(value, date):
-                        new_row[col_name] = value.isoformat()
-                    else:
-                        new_row[col_name] = value
-                table_copy['rows'].append(new_row)
-            serializable_tables[table_name] = table_copy
-
-        with open(self.db_file, 'w') as f:
-            json.dump({'tables': serializable_tables}, f, indent=2)
+            self._vacuum(table)    # Deleted rows are never written to the snapshot
+            # Indexes and derived lookups are rebuilt on load, not saved
+            serializable_tables[table_name] = {
+                'columns': table.columns,
+                'primary_key': table.primary_key,
+                'uniques': table.uniques,
+                'cols': table.cols,
+            }
+
+        # Write to a temp file first so a crash never leaves a half-written snapshot
+        # Serialize once and hand the whole snapshot to a single write();
+        # json.dump would issue a write per token
+        payload = _dumps({'lsn': self._lsn, 'tables': serializable_tables}, pretty)
+        tmp_file = self.db_file + '.tmp'
+        with open(tmp_file, 'wb', buffering=1 << 20) as f:
+            f.write(payload)
+        os.replace(tmp_file, self.db_file)
 
     # ---------------- Table Management ----------------
+    @_locked
     def create_table(self, table_name, columns, primary_key, uniques=None):
         if uniques is None:
             uniques = []
@@ -57,17 +514,17 @@ class SimpleRDBMS:
         column_names = [col[0] for col in columns]
         if primary_key not in column_names:
             raise ValueError("Primary key must be one of the columns")
-        self.tables[table_name] = {
-            'columns': columns,
-            'rows': [],
-            'primary_key': primary_key,
-            'uniques': uniques,
-            'indexes': {}
-        }
+        for col in uniques:
+            if col not in column_names:
+                raise ValueError(f"Invalid column: {col}")
+        line = self._encode('create', table_name, columns=columns,
+                            primary_key=primary_key, uniques=uniques)
+        self.tables[table_name] = Table(columns, {name: [] for name in column_names},
+                                        primary_key, uniques)
         self.create_index(table_name, primary_key)
         for col in uniques:
             self.create_index(table_name, col)
-        self._save_to_file()
+        self._log(line)
 
     # ---------------- Validation ----------------
     def _validate_data(self, table, data, require_pk=True):
@@ -75,114 +532,348 @@ class SimpleRDBMS:
         Validate a row of data.
         `require_pk=False` for updates where PK is not being changed.
         """
-        columns_dict = {name: dtype for name, dtype in table['columns']}
+        # One lookup and one call per field, the type checks were resolved when the Table was built
+        coercers = table._coercers
         for col, val in data.items():
-            if col not in columns_dict:
+            coerce = coercers.get(col)
+            if coerce is None:
                 raise ValueError(f"Invalid column: {col}")
-            dtype = columns_dict[col]
-            if dtype == 'int':
-                data[col] = int(val)
-            elif dtype == 'str':
-                data[col] = str(val)
-            elif dtype == 'date':
-                if isinstance(val, str):
-                    data[col] = date.fromisoformat(val)
-                elif not isinstance(val, date):
-                    raise ValueError(f"{col} must be a date")
-        if require_pk and table['primary_key'] not in data:
+            data[col] = coerce(val)
+        if require_pk and table.primary_key not in data:
             raise ValueError("Primary key is required")
 
     # ---------------- CRUD ----------------
+    @_locked
     def insert(self, table_name, data):
         table = self.tables.get(table_name)
         if not table:
             raise ValueError("Table not found")
         self._validate_data(table, data, require_pk=True)
 
-        pk = table['primary_key']
-        if any(row[pk] == data[pk] for row in table['rows']):
+        # PK and unique columns are always indexed, so these are hash lookups
+        pk = table.primary_key
+        if data[pk] in table.indexes[pk]:
             raise ValueError("Duplicate primary key")
-        for col in table['uniques']:
-            if col in data and any(row.get(col) == data[col] for row in table['rows']):
+        for col in table.uniques:
+            if col in data and data[col] in table.indexes[col]:
                 raise ValueError(f"Duplicate value in unique column: {col}")
 
-        table['rows'].append(data)
-        self._update_indexes(table_name, len(table['rows']) - 1)
-        self._save_to_file()
+        line = self._encode('insert', table_name, row=data)
+        for col, values in table.cols.items():
+            values.append(data.get(col))
+        self._update_indexes(table, len(table.cols[pk]) - 1, data)
+        if table._max_pk is not None and data[pk] > table._max_pk:
+            table._max_pk = data[pk]
+        self._log(line)
 
     def select(self, table_name, where=None):
         table = self.tables.get(table_name)
         if not table:
             raise ValueError("Table not found")
         if where is None:
-            return [row.copy() for row in table['rows']]
-        results = [
-            row.copy()
-            for row in table['rows']
-            if all(row.get(k) == v for k, v in where.items())
-        ]
-        return results
+            return self._rows(table, self._live_positions(table))
+        return self._rows(table, self._match(table, where))
+
+    def _match(self, table, where):
+        """
+        Return the positions of the rows matching every `where` condition.
+        A condition is either a value (equality) or an (operator, value) tuple:
+        ('<', v), ('<=', v), ('>', v), ('>=', v) or ('BETWEEN', low, high).
+        """
+        cols = table.cols
+        conditions = []
+        for k, cond in where.items():
+            if k not in cols:
+                raise ValueError(f"Invalid column: {k}")
+            if isinstance(cond, tuple):
+                op, *operands = cond
+                if (op not in _OP_TESTS or len(operands) != (2 if op == 'BETWEEN' else 1)
+                        or None in operands):
+                    raise ValueError(f"Invalid condition on {k}: {cond}")
+                # Range bounds must have the column's type to be ordered against it
+                operands = [self._coerce_value(table, k, v) for v in operands]
+                wanted = tuple(operands) if op == 'BETWEEN' else operands[0]
+            else:
+                # Equality values too, so '2000-01-01' finds a date and 5 finds '5'
+                op, wanted = '=', self._coerce_value(table, k, cond)
+            conditions.append((k, op, wanted))
+
+        # Probe an index instead of scanning every row: a hash index for an
+        # equality first, else a sorted index for any condition. The remaining
+        # conditions are only checked against its matches.
+        probed = next((c for c in conditions if c[1] == '=' and c[0] in table.indexes), None)
+        if probed is None:
+            probed = next((c for c in conditions if c[0] in table.sorted_indexes), None)
+        if probed is None:
+            positions = self._live_positions(table)
+            if positions is None:
+                positions = range(len(cols[table.primary_key]))
+        elif probed[1] == '=' and probed[0] in table.indexes:
+            positions = sorted(table.indexes[probed[0]].get(probed[2], []))
+        else:
+            positions = self._sorted_range(table, *probed)
+
+        remaining = [c for c in conditions if c is not probed]
+        if probed is None and np is not None:
+            # Conditions on numpy-backed int columns are evaluated over the whole array in C
+            vector = [c for c in remaining if self._vectorizable(table, c)]
+            if vector:
+                positions = self._vector_match(table, vector)
+                remaining = [c for c in remaining if c not in vector]
+        if not remaining:
+            return positions
+        # One pass checks every remaining condition via a cached generated filter
+        row_filter = _compile_filter(tuple(op for _, op, _ in remaining))
+        return row_filter(positions, *[_filter_column(cols[k], positions) for k, _, _ in remaining],
+                          *[wanted for _, _, wanted in remaining])
+
+    @staticmethod
+    def _vectorizable(table, condition):
+        column, op, wanted = condition
+        operands = wanted if op == 'BETWEEN' else (wanted,)
+        return (isinstance(table.cols[column], IntColumn)
+                and all(_fits_int64(w) for w in operands))
+
+    @staticmethod
+    def _vector_match(table, conditions):
+        """Positions of live rows passing every condition, computed with numpy masks."""
+        mask = None
+        for column, op, wanted in conditions:
+            arr = table.cols[column].array()
+            if op == 'BETWEEN':
+                hit = (arr >= wanted[0]) & (arr <= wanted[1])
+            else:
+                hit = _ARRAY_OPS[op](arr, wanted)
+            if op != '=':
+                hit &= arr != IntColumn.NULL      # Missing values never match a range
+            mask = hit if mask is None else mask & hit
+        if table._dead:
+            mask[list(table._dead)] = False
+        return np.flatnonzero(mask).tolist()
+
+    @staticmethod
+    def _coerce_value(table, column, value):
+        """Convert a WHERE value to the column's type; None (missing) is left as is."""
+        if value is None:
+            return None
+        return table._coercers[column](value)
+
+    def count(self, table_name):
+        """Number of rows in a table, without copying them."""
+        table = self.tables.get(table_name)
+        if not table:
+            raise ValueError("Table not found")
+        return len(table.cols[table.primary_key]) - len(table._dead)
+
+    def max_pk(self, table_name):
+        """Largest primary key in a table, or None if it is empty."""
+        table = self.tables.get(table_name)
+        if not table:
+            raise ValueError("Table not found")
+        if table._max_pk is None:
+            # Only rescanned after the current max was deleted; inserts keep it up to date
+            table._max_pk = max(table.indexes[table.primary_key], default=None)
+        return table._max_pk
+
+    @staticmethod
+    def _value_tuples(table, positions=None):
+        """Gather row tuples from the column lists, only at the API boundary."""
+        columns = table.cols.values()
+        if positions is not None:
+            columns = [_take(values, positions) for values in columns]
+        return zip(*columns)
+
+    def _rows(self, table, positions=None):
+        index = table._index
+        # map() builds the result list in C, with no per-row bytecode
+        return list(map(RowView, self._value_tuples(table, positions), repeat(index)))
 
+    @_locked
     def update(self, table_name, where, updates):
         table = self.tables.get(table_name)
         if not table:
             raise ValueError("Table not found")
-        pk = table['primary_key']
-        if pk not in where:
+        pk = table.primary_key
+        if pk not in where or isinstance(where[pk], tuple):
             raise ValueError("Primary key required for update")
-        for idx, row in enumerate(table['rows']):
-            if row[pk] == where[pk]:
-                self._validate_data(table, updates, require_pk=False)
-                for k, v in updates.items():
-                    if k == pk:
-                        raise ValueError("Cannot update primary key")
-                    row[k] = v
-                self._update_indexes(table_name, idx, rebuild=True)
-                self._save_to_file()
-                return
-        raise ValueError("Row not found")
+        # Coerced before the lookup and the log, so replay finds the same row
+        key = self._coerce_value(table, pk, where[pk])
+        idx = self._find_by_pk(table, key)
+        self._validate_data(table, updates, require_pk=False)
+        if pk in updates:
+            raise ValueError("Cannot update primary key")
+        line = self._encode('update', table_name, where={pk: key}, updates=updates)
+        for k, v in updates.items():
+            values = table.cols[k]
+            if k in table.indexes:
+                self._unindex_value(table, k, values[idx], idx)
+                table.indexes[k].setdefault(v, []).append(idx)
+            if k in table.sorted_indexes:
+                self._sorted_remove(table, k, values[idx], idx)
+                self._sorted_add(table, k, v, idx)
+            values[idx] = v
+        self._log(line)
 
+    @_locked
     def delete(self, table_name, where):
         table = self.tables.get(table_name)
         if not table:
             raise ValueError("Table not found")
-        pk = table['primary_key']
-        if pk not in where:
+        pk = table.primary_key
+        if pk not in where or isinstance(where[pk], tuple):
             raise ValueError("Primary key required for delete")
-        for idx, row in enumerate(table['rows']):
-            if row[pk] == where[pk]:
-                del table['rows'][idx]
-                self._rebuild_indexes(table_name)
-                self._save_to_file()
-                return
-        raise ValueError("Row not found")
+        key = self._coerce_value(table, pk, where[pk])
+        idx = self._find_by_pk(table, key)
+        line = self._encode('delete', table_name, where={pk: key})
+        if table.cols[pk][idx] == table._max_pk:
+            table._max_pk = None
+        # Leave a tombstone instead of shifting every later row and index entry
+        for col, values in table.cols.items():
+            if col in table.indexes:
+                self._unindex_value(table, col, values[idx], idx)
+            if col in table.sorted_indexes:
+                self._sorted_remove(table, col, values[idx], idx)
+            values[idx] = None
+        dead = table._dead
+        dead.add(idx)
+        # Reclaim the space once most of the table is tombstones
+        if len(dead) * 2 > len(table.cols[pk]):
+            self._vacuum(table)
+        self._log(line)
+
+    def _vacuum(self, table):
+        """Drop tombstoned rows and rebuild the indexes for the new positions."""
+        dead = table._dead
+        if not dead:
+            return
+        live = self._live_positions(table)
+        for values in table.cols.values():
+            values[:] = _take(values, live)
+        dead.clear()
+        for col in table.indexes:
+            table.indexes[col] = self._hash_column(table, col)
+        for col in table.sorted_indexes:
+            table.sorted_indexes[col] = self._sort_column(table, col)
 
     # ---------------- Indexing ----------------
     def create_index(self, table_name, column):
         table = self.tables.get(table_name)
         if not table:
             raise ValueError("Table not found")
-        table['indexes'][column] = {}
+        if column not in table.cols:
+            raise ValueError(f"Invalid column: {column}")
+        table.indexes[column] = {}
         self._rebuild_indexes(table_name, [column])
 
-    def _update_indexes(self, table_name, row_idx, rebuild=False):
-        table = self.tables[table_name]
-        row = table['rows'][row_idx]
-        for col in table['indexes']:
-            if rebuild:
-                self._rebuild_indexes(table_name, [col])
-            else:
-                val = row.get(col)
-                table['indexes'][col].setdefault(val, []).append(row_idx)
+    def _update_indexes(self, table, row_idx, row):
+        # Values come from the inserted row, not read back out of the columns
+        for col, index in table.indexes.items():
+            index.setdefault(row.get(col), []).append(row_idx)
+        for col in table.sorted_indexes:
+            self._sorted_add(table, col, row.get(col), row_idx)
+
+    def _unindex_value(self, table, column, value, row_idx):
+        index = table.indexes[column]
+        bucket = index[value]
+        bucket.remove(row_idx)
+        if not bucket:
+            del index[value]
+
+    def _find_by_pk(self, table, pk_value):
+        """Return the position of the row with this primary key via the PK index."""
+        idx_list = table.indexes[table.primary_key].get(pk_value)
+        if not idx_list:
+            raise ValueError("Row not found")
+        return idx_list[0]
 
     def _rebuild_indexes(self, table_name, columns=None):
         table = self.tables[table_name]
         if columns is None:
-            columns = list(table['indexes'].keys())
+            columns = list(table.indexes.keys())
         for col in columns:
-            table['indexes'][col] = {}
-            for idx, row in enumerate(table['rows']):
-                table['indexes'][col].setdefault(row.get(col), []).append(idx)
+            table.indexes[col] = self._hash_column(table, col)
+
+    @classmethod
+    def _hash_column(cls, table, column):
+        """Map each value of a column to the positions of live rows holding it."""
+        buckets = {}
+        for idx, val in cls._live_items(table, column):
+            buckets.setdefault(val, []).append(idx)
+        return buckets
+
+    def create_sorted_index(self, table_name, column):
+        """
+        Keep a column's values in sorted order (with their row positions alongside)
+        so <, <=, >, >= and BETWEEN conditions can use binary search instead of a scan.
+        """
+        table = self.tables.get(table_name)
+        if not table:
+            raise ValueError("Table not found")
+        if column not in table.cols:
+            raise ValueError(f"Invalid column: {column}")
+        table.sorted_indexes[column] = self._sort_column(table, column)
+
+    @classmethod
+    def _sort_column(cls, table, column):
+        # None (missing) values cannot be ordered and never match a range, so skip them
+        pairs = sorted((val, idx) for idx, val in cls._live_items(table, column)
+                       if val is not None)
+        return [val for val, _ in pairs], [idx for _, idx in pairs]
+
+    @staticmethod
+    def _sorted_add(table, column, value, row_idx):
+        if value is None:
+            return
+        values, positions = table.sorted_indexes[column]
+        i = bisect_right(values, value)
+        values.insert(i, value)
+        positions.insert(i, row_idx)
+
+    @staticmethod
+    def _sorted_remove(table, column, value, row_idx):
+        if value is None:
+            return
+        values, positions = table.sorted_indexes[column]
+        i = positions.index(row_idx, bisect_left(values, value), bisect_right(values, value))
+        del values[i]
+        del positions[i]
+
+    @staticmethod
+    def _sorted_range(table, column, op, wanted):
+        """Row positions (in row order) whose value passes the condition, via binary search."""
+        values, positions = table.sorted_indexes[column]
+        lo, hi = 0, len(values)
+        if op == '=':
+            lo, hi = bisect_left(values, wanted), bisect_right(values, wanted)
+        elif op == '<':
+            hi = bisect_left(values, wanted)
+        elif op == '<=':
+            hi = bisect_right(values, wanted)
+        elif op == '>':
+            lo = bisect_right(values, wanted)
+        elif op == '>=':
+            lo = bisect_left(values, wanted)
+        elif op == 'BETWEEN':
+            lo, hi = bisect_left(values, wanted[0]), bisect_right(values, wanted[1])
+        return sorted(positions[lo:hi])
+
+    @staticmethod
+    def _live_items(table, column):
+        """(position, value) pairs of a column, skipping deleted rows."""
+        items = enumerate(table.cols[column])
+        dead = table._dead
+        if not dead:
+            return items
+        return ((i, v) for i, v in items if i not in dead)
+
+    @staticmethod
+    def _live_positions(table):
+        """Positions of rows that are not deleted, or None when every row is live."""
+        dead = table._dead
+        if not dead:
+            return None
+        n = len(table.cols[table.primary_key])
+        return [i for i in range(n) if i not in dead]
 
     # ---------------- Join ----------------
     def join(self, table_name1, table_name2, on_column):
@@ -190,15 +881,35 @@ class SimpleRDBMS:
         t2 = self.tables.get(table_name2)
         if not t1 or not t2:
             raise ValueError("Table not found")
-        results = []
         # Attempt to match columns intelligently: if on_column missing in t2, try primary key
-        for r1 in t1['rows']:
-            for r2 in t2['rows']:
-                val1 = r1.get(on_column)
-                val2 = r2.get(on_column) or r2.get(t2['primary_key'])
-                if val1 == val2:
-                    combined = r1.copy()
-                    for k, v in r2.items():
-                        combined[f"{table_name2}_{k}"] = v
-                    results.append(combined)
-        return results
+        t2_columns = [name for name, _ in t2.columns]
+        key2 = on_column if on_column in t2_columns else t2.primary_key
+
+        if on_column not in t1.cols:
+            raise ValueError(f"Invalid column: {on_column}")
+
+        # Hash join on the key columns: one pass builds buckets, one pass probes them
+        if key2 in t2.indexes:
+            # t2 already keeps a hash index on the join column, probe it directly
+            index = t2.indexes[key2]
+            pairs = [(i, j) for i, v in self._live_items(t1, on_column)
+                     for j in index.get(v, ())]
+        elif self.count(table_name1) <= self.count(table_name2):
+            buckets = self._hash_column(t1, on_column)
+            pairs = [(i, j) for j, v in self._live_items(t2, key2)
+                     for i in buckets.get(v, ())]
+        else:
+            buckets = self._hash_column(t2, key2)
+            pairs = [(i, j) for i, v in self._live_items(t1, on_column)
+                     for j in buckets.get(v, ())]
+
+        # Rows come out in t1's row order, then t2's, whichever side was bucketed
+        # (timsort makes this nearly free when the pairs are already in order)
+        pairs.sort()
+
+        # Only matched pairs are turned into rows, all sharing one position map
+        names = list(t1.cols) + [f"{table_name2}_{k}" for k in t2.cols]
+        index = {name: i for i, name in enumerate(names)}
+        left = self._value_tuples(t1, [i for i, _ in pairs])
+        right = self._value_tuples(t2, [j for _, j in pairs])
+        return list(map(RowView, map(tuple.__add__, left, right), repeat(index)))
@@ -1,171 +1,336 @@
-import re                      # Used to match and extract parts of commands
 from database import SimpleRDBMS
 
+# ---------- Tokens ----------
+# Token kinds yielded by tokenize()
+KEYWORD = 'KEYWORD'
+IDENT = 'IDENT'
+NUMBER = 'NUMBER'
+STRING = 'STRING'
+PUNCT = 'PUNCT'
+END = 'END'
 
-def parse_command(db, command):
+_KEYWORDS = frozenset({
+    'CREATE', 'TABLE', 'PRIMARY', 'KEY', 'UNIQUE',
+    'INSERT', 'INTO', 'VALUES', 'SELECT', 'FROM', 'WHERE', 'AND',
+    'UPDATE', 'SET', 'DELETE', 'JOIN', 'ON', 'BETWEEN',
+})
+_PUNCT = frozenset('(),;=*<>')
+_COMPARISONS = frozenset({'=', '<', '<=', '>', '>='})
+_SPACE = frozenset(' \t\r\n')
+_DIGITS = frozenset('0123456789')
+_WORD_END = _SPACE | _PUNCT | {"'"}     # Any of these ends a bare word
+
+
+class _Keyword(str):
     """
-    Takes a text command (SQL-like) and runs the correct database action.
+    Text of a KEYWORD token: equal to the uppercase keyword, with the word as
+    typed kept in `spelling` so an unquoted value such as Create reads back unchanged.
+    """
+
+    def __new__(cls, keyword, spelling):
+        self = super().__new__(cls, keyword)
+        self.spelling = spelling
+        return self
+
+
+# Keywords as usually typed (UPPER, lower, Capitalized) -> keyword, so most words
+# are classified with one dict lookup instead of making an uppercased copy
+_KEYWORD_SPELLINGS = {}
+for _keyword in _KEYWORDS:
+    for _spelling in (_keyword, _keyword.lower(), _keyword.capitalize()):
+        _KEYWORD_SPELLINGS[_spelling] = _Keyword(_keyword, _spelling)
+_MAX_KEYWORD_LEN = max(len(k) for k in _KEYWORDS)
+
+
+def tokenize(src):
+    """
+    Scan a command once, left to right, yielding (kind, text) tokens.
+    Quoted strings keep their commas and '=' signs; '' inside quotes is a literal quote.
+    """
+    i = 0
+    n = len(src)
+    while i < n:
+        ch = src[i]
+        if ch in _SPACE:
+            i += 1
+        elif ch in _PUNCT:
+            # '<=' and '>=' are single tokens
+            if ch in '<>' and src.startswith('=', i + 1):
+                yield PUNCT, ch + '='
+                i += 2
+            else:
+                yield PUNCT, ch
+                i += 1
+        elif ch == "'":
+            # Quoted string: read up to the closing quote
+            chars = []
+            i += 1
+            while True:
+                j = src.find("'", i)
+                if j == -1:
+                    raise ValueError("Unterminated string")
+                chars.append(src[i:j])
+                if src.startswith("''", j):
+                    chars.append("'")
+                    i = j + 2
+                else:
+                    i = j + 1
+                    break
+            yield STRING, ''.join(chars)
+        else:
+            # Bare word: keyword, identifier, number, or unquoted value like 2000-01-01
+            j = i + 1
+            while j < n and src[j] not in _WORD_END:
+                j += 1
+            word = src[i:j]
+            digits = word[1:] if word[0] == '-' else word
+            if digits and _DIGITS.issuperset(digits):
+                yield NUMBER, word
+            else:
+                keyword = _KEYWORD_SPELLINGS.get(word)
+                # Only oddly-cased words that could still be a keyword get uppercased
+                if (keyword is None and len(word) <= _MAX_KEYWORD_LEN
+                        and not word.islower() and not word.isupper()):
+                    upper = word.upper()
+                    keyword = _Keyword(upper, word) if upper in _KEYWORDS else None
+                if keyword is not None:
+                    yield KEYWORD, keyword
+                else:
+                    yield IDENT, word
+            i = j
+    yield END, ''
+
+
+class _Tokens:
+    """Cursor over the tokens of one statement, used by the parse functions."""
+
+    def __init__(self, tokens, statement):
+        self.tokens = tokens
+        self.pos = 0
+        self.statement = statement      # Used in error messages, e.g. "Invalid INSERT syntax"
+
+    def peek(self):
+        return self.tokens[self.pos]
+
+    def next(self):
+        token = self.tokens[self.pos]
+        if token[0] != END:
+            self.pos += 1
+        return token
+
+    def accept(self, kind, text=None):
+        """Consume the next token if it matches, returning whether it did."""
+        tok_kind, tok_text = self.peek()
+        if tok_kind == kind and (text is None or tok_text == text):
+            self.pos += 1
+            return True
+        return False
+
+    def expect(self, kind, text=None):
+        tok_kind, tok_text = self.next()
+        if tok_kind != kind or (text is not None and tok_text != text):
+            raise ValueError(f"Invalid {self.statement} syntax: expected {text or kind.lower()}, "
+                             f"found {tok_text or 'end of command'}")
+        return tok_text
+
+    def ident(self):
+        return self.expect(IDENT)
+
+    def value(self):
+        """A literal: numbers become int, quoted or bare words stay str."""
+        kind, text = self.next()
+        if kind == NUMBER:
+            return int(text)
+        if kind in (STRING, IDENT):
+            return text
+        if kind == KEYWORD:
+            return text.spelling        # A bare word that happens to spell a keyword
+        raise ValueError(f"Invalid {self.statement} syntax: expected a value, "
+                         f"found {text or 'end of command'}")
+
+    def end(self):
+        self.accept(PUNCT, ';')
+        self.expect(END)
+
+
+def _parse_conditions(tokens):
+    """
+    col = value [AND col > value AND col BETWEEN low AND high ...]
+    -> {'col': value, 'col2': ('>', value), 'col3': ('BETWEEN', low, high)}
     """
-    command = command.strip()          # Remove extra spaces
-    upper_command = command.upper()    # Uppercase copy for keyword checks
-
-    # ---------- CREATE TABLE ----------
-    if upper_command.startswith('CREATE TABLE'):
-        # Match: CREATE TABLE users (id int PRIMARY KEY, name str UNIQUE);
-        match = re.search(r'CREATE TABLE (\w+) \((.*)\);', command, re.IGNORECASE)
-        if not match:
-            raise ValueError("Invalid CREATE syntax")
-
-        table_name = match.group(1)
-        cols_str = match.group(2)
-
-        parts = [p.strip() for p in cols_str.split(',')]
-        columns = []
-        primary = None
-        uniques = []
-
-        # Read column definitions
-        for part in parts:
-            info = part.split()
-            col_name = info[0]
-            col_type = info[1].lower()
-            columns.append((col_name, col_type))
-
-            if 'PRIMARY KEY' in part.upper():
+    where = {}
+    while True:
+        key = tokens.ident()
+        if key in where:
+            # Conditions are keyed by column; ranges on one column use BETWEEN
+            raise ValueError(f"Only one condition per column is supported: {key}")
+        if tokens.accept(KEYWORD, 'BETWEEN'):
+            low = tokens.value()
+            tokens.expect(KEYWORD, 'AND')
+            where[key] = ('BETWEEN', low, tokens.value())
+        else:
+            kind, op = tokens.next()
+            if kind != PUNCT or op not in _COMPARISONS:
+                raise ValueError(f"Invalid {tokens.statement} syntax: expected a comparison, "
+                                 f"found {op or 'end of command'}")
+            value = tokens.value()
+            where[key] = value if op == '=' else (op, value)
+        if not tokens.accept(KEYWORD, 'AND'):
+            return where
+
+
+# ---------- CREATE TABLE ----------
+def _do_create(db, tokens):
+    # Example: CREATE TABLE users (id int PRIMARY KEY, name str UNIQUE);
+    tokens.expect(KEYWORD, 'TABLE')
+    table_name = tokens.ident()
+    tokens.expect(PUNCT, '(')
+
+    columns = []
+    primary = None
+    uniques = []
+
+    # Read column definitions
+    while True:
+        col_name = tokens.ident()
+        col_type = tokens.ident().lower()
+        columns.append((col_name, col_type))
+        while True:
+            if tokens.accept(KEYWORD, 'PRIMARY'):
+                tokens.expect(KEYWORD, 'KEY')
                 primary = col_name
-            if 'UNIQUE' in part.upper():
+            elif tokens.accept(KEYWORD, 'UNIQUE'):
                 uniques.append(col_name)
+            else:
+                break
+        if not tokens.accept(PUNCT, ','):
+            break
+    tokens.expect(PUNCT, ')')
+    tokens.end()
+
+    if primary is None:
+        raise ValueError("PRIMARY KEY is required")
 
-        if primary is None:
-            raise ValueError("PRIMARY KEY is required")
-
-        db.create_table(table_name, columns, primary, uniques)
-        return None
-
-    # ---------- INSERT ----------
-    elif upper_command.startswith('INSERT INTO'):
-        # Match: INSERT INTO users (id, name) VALUES (1, 'Sam');
-        match = re.search(r'INSERT INTO (\w+) \((.*)\) VALUES \((.*)\);', command, re.IGNORECASE)
-        if not match:
-            raise ValueError("Invalid INSERT syntax")
-
-        table_name = match.group(1)
-        cols = [c.strip() for c in match.group(2).split(',')]
-        vals_raw = [v.strip().strip("'") for v in match.group(3).split(',')]
-
-        # Convert values to int when possible
-        values = []
-        for v in vals_raw:
-            try:
-                values.append(int(v))
-            except ValueError:
-                values.append(v)
-
-        data = dict(zip(cols, values))
-        db.insert(table_name, data)
-        return None
-
-    # ---------- SELECT ----------
-    elif upper_command.startswith('SELECT'):
-        # Only supports: SELECT * FROM table WHERE ...
-        parts = command.split()
-        if parts[1] != '*' or parts[2].upper() != 'FROM':
-            raise ValueError("Only SELECT * is supported")
-
-        table_name = parts[3]
-        where = None
-
-        # Handle WHERE clause
-        if 'WHERE' in upper_command:
-            where_str = command.split('WHERE')[1].strip(';').strip()
-            conditions = where_str.split(' AND ')
-            where = {}
-
-            for cond in conditions:
-                key, val = cond.split('=')
-                key = key.strip()
-                val = val.strip().strip("'")
-                try:
-                    val = int(val)
-                except ValueError:
-                    pass
-                where[key] = val
-
-        return db.select(table_name, where)
-
-    # ---------- UPDATE ----------
-    elif upper_command.startswith('UPDATE'):
-        # Match: UPDATE users SET name='New' WHERE id=1;
-        match = re.search(r'UPDATE (\w+) SET (.*) WHERE (.*);', command, re.IGNORECASE)
-        if not match:
-            raise ValueError("Invalid UPDATE syntax")
-
-        table_name = match.group(1)
-        sets_str = match.group(2)
-        where_str = match.group(3)
-
-        updates = {}
-        for pair in sets_str.split(','):
-            key, val = pair.split('=')
-            key = key.strip()
-            val = val.strip().strip("'")
-            try:
-                val = int(val)
-            except ValueError:
-                pass
-            updates[key] = val
-
-        where = {}
-        for cond in where_str.split(' AND '):
-            key, val = cond.split('=')
-            key = key.strip()
-            val = val.strip().strip("'")
-            try:
-                val = int(val)
-            except ValueError:
-                pass
-            where[key] = val
-
-        db.update(table_name, where, updates)
-        return None
-
-    # ---------- DELETE ----------
-    elif upper_command.startswith('DELETE FROM'):
-        # Example: DELETE FROM users WHERE id=1;
-        parts = command.split()
-        if parts[3].upper() != 'WHERE':
-            raise ValueError("DELETE requires WHERE clause")
-
-        table_name = parts[2]
-        where_str = command.split('WHERE')[1].strip(';').strip()
-
-        where = {}
-        for cond in where_str.split(' AND '):
-            key, val = cond.split('=')
-            key = key.strip()
-            val = val.strip().strip("'")
-            try:
-                val = int(val)
-            except ValueError:
-                pass
-            where[key] = val
-
-        db.delete(table_name, where)
-        return None
-
-    # ---------- JOIN ----------
-    elif upper_command.startswith('JOIN'):
-        # Example: JOIN users orders ON id;
-        parts = command.split()
-        if len(parts) < 5 or parts[3].upper() != 'ON':
-            raise ValueError("Invalid JOIN syntax")
-
-        table1 = parts[1]
-        table2 = parts[2]
-        on_column = parts[4].strip(';')
-
-        return db.join(table1, table2, on_column)
+    db.create_table(table_name, columns, primary, uniques)
+    return None
+
+
+# ---------- INSERT ----------
+def _do_insert(db, tokens):
+    # Example: INSERT INTO users (id, name) VALUES (1, 'Sam');
+    tokens.expect(KEYWORD, 'INTO')
+    table_name = tokens.ident()
+
+    tokens.expect(PUNCT, '(')
+    cols = [tokens.ident()]
+    while tokens.accept(PUNCT, ','):
+        cols.append(tokens.ident())
+    tokens.expect(PUNCT, ')')
+
+    tokens.expect(KEYWORD, 'VALUES')
+    tokens.expect(PUNCT, '(')
+    values = [tokens.value()]
+    while tokens.accept(PUNCT, ','):
+        values.append(tokens.value())
+    tokens.expect(PUNCT, ')')
+    tokens.end()
+
+    if len(cols) != len(values):
+        raise ValueError("Invalid INSERT syntax: column and value counts differ")
+
+    data = dict(zip(cols, values))
+    db.insert(table_name, data)
+    return None
+
+
+# ---------- SELECT ----------
+def _do_select(db, tokens):
+    # Only supports: SELECT * FROM table WHERE ...
+    if not tokens.accept(PUNCT, '*') or not tokens.accept(KEYWORD, 'FROM'):
+        raise ValueError("Only SELECT * is supported")
+
+    table_name = tokens.ident()
+    where = None
+
+    # Handle WHERE clause
+    if tokens.accept(KEYWORD, 'WHERE'):
+        where = _parse_conditions(tokens)
+    tokens.end()
+
+    return db.select(table_name, where)
+
+
+# ---------- UPDATE ----------
+def _do_update(db, tokens):
+    # Example: UPDATE users SET name='New' WHERE id=1;
+    table_name = tokens.ident()
+    tokens.expect(KEYWORD, 'SET')
+
+    updates = {}
+    while True:
+        key = tokens.ident()
+        tokens.expect(PUNCT, '=')
+        updates[key] = tokens.value()
+        if not tokens.accept(PUNCT, ','):
+            break
+
+    tokens.expect(KEYWORD, 'WHERE')
+    where = _parse_conditions(tokens)
+    tokens.end()
+
+    db.update(table_name, where, updates)
+    return None
+
+
+# ---------- DELETE ----------
+def _do_delete(db, tokens):
+    # Example: DELETE FROM users WHERE id=1;
+    tokens.expect(KEYWORD, 'FROM')
+    table_name = tokens.ident()
+    if not tokens.accept(KEYWORD, 'WHERE'):
+        raise ValueError("DELETE requires WHERE clause")
+    where = _parse_conditions(tokens)
+    tokens.end()
+
+    db.delete(table_name, where)
+    return None
+
+
+# ---------- JOIN ----------
+def _do_join(db, tokens):
+    # Example: JOIN users orders ON id;
+    table1 = tokens.ident()
+    table2 = tokens.ident()
+    if not tokens.accept(KEYWORD, 'ON'):
+        raise ValueError("Invalid JOIN syntax")
+    on_column = tokens.ident()
+    tokens.end()
+
+    return db.join(table1, table2, on_column)
+
+
+# First keyword of a command -> the function that parses and runs it
+_DISPATCH = {
+    'CREATE': _do_create,
+    'INSERT': _do_insert,
+    'SELECT': _do_select,
+    'UPDATE': _do_update,
+    'DELETE': _do_delete,
+    'JOIN': _do_join,
+}
+
+
+def parse_command(db, command):
+    """
+    Takes a text command (SQL-like) and runs the correct database action.
+    """
+    tokens = list(tokenize(command))
+    kind, keyword = tokens[0]
+    handler = _DISPATCH.get(keyword) if kind == KEYWORD else None
 
     # ---------- UNKNOWN ----------
-    else:
+    if handler is None:
         raise ValueError("Unknown command")
+    cursor = _Tokens(tokens, keyword)
+    cursor.next()                      # Skip the keyword that picked the handler
+    return handler(db, cursor)
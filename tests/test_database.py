@@ -1,5 +1,8 @@
 import pytest
 import os                  # For cleaning up test JSON file after tests
+import sys
+import threading
+import database
 from database import SimpleRDBMS
 from datetime import date
 
@@ -8,12 +11,14 @@ from datetime import date
 def db():
     """
     Creates a temporary database instance for testing.
-    Cleans up the JSON file after the test.
+    Cleans up the JSON file and its write-ahead log after the test.
     """
     test_db = SimpleRDBMS('test_database.json')
     yield test_db
-    if os.path.exists('test_database.json'):
-        os.remove('test_database.json')
+    test_db.close()
+    for path in ('test_database.json', 'test_database.json.wal'):
+        if os.path.exists(path):
+            os.remove(path)
 
 # ---------------- Test: Create Table ----------------
 def test_create_table(db):
@@ -22,8 +27,8 @@ def test_create_table(db):
     """
     db.create_table('test', [('id', 'int'), ('name', 'str')], 'id', uniques=['name'])
     assert 'test' in db.tables
-    assert db.tables['test']['primary_key'] == 'id'
-    assert db.tables['test']['uniques'] == ['name']
+    assert db.tables['test'].primary_key == 'id'
+    assert db.tables['test'].uniques == ['name']
 
 # ---------------- Test: Insert & Select ----------------
 def test_insert_and_select(db):
@@ -36,6 +41,9 @@ def test_insert_and_select(db):
     assert len(results) == 1
     assert results[0]['id'] == 1
     assert results[0]['dob'] == date(2000, 1, 1)
+    # Rows come back read-only
+    with pytest.raises(TypeError):
+        results[0]['id'] = 2
 
 # ---------------- Test: Constraints ----------------
 def test_constraints(db):
@@ -47,6 +55,22 @@ def test_constraints(db):
     # Duplicate primary key should raise error
     with pytest.raises(ValueError, match="Duplicate primary key"):
         db.insert('test', {'id': 1})
+    # Unknown columns are rejected before anything is registered
+    with pytest.raises(ValueError, match="Invalid column: nope"):
+        db.create_index('test', 'nope')
+    assert 'nope' not in db.tables['test'].indexes
+    with pytest.raises(ValueError, match="Invalid column: zzz"):
+        db.create_table('bad', [('id', 'int')], 'id', uniques=['zzz'])
+    assert 'bad' not in db.tables
+    db.compact()
+    # A value the log cannot store is rejected before the table changes
+    db.create_table('blobs', [('id', 'int'), ('obj', 'any')], 'id')
+    with pytest.raises(TypeError):
+        db.insert('blobs', {'id': 1, 'obj': object()})
+    assert db.count('blobs') == 0
+    if database.np is not None or database.orjson is not None:
+        with pytest.raises(ValueError, match="out of range"):
+            db.insert('test', {'id': 2 ** 70})
 
 # ---------------- Test: Update & Delete ----------------
 def test_update_delete(db):
@@ -61,6 +85,126 @@ def test_update_delete(db):
     db.delete('test', {'id': 1})
     assert db.select('test') == []
 
+# ---------------- Test: Indexed Select ----------------
+def test_select_with_index(db):
+    """
+    WHERE on an indexed column combined with a non-indexed one.
+    """
+    db.create_table('test', [('id', 'int'), ('name', 'str'), ('age', 'int')], 'id')
+    db.insert('test', {'id': 1, 'name': 'Sam', 'age': 30})
+    db.insert('test', {'id': 2, 'name': 'Ann', 'age': 30})
+    assert db.select('test', {'id': 2, 'age': 30}) == [{'id': 2, 'name': 'Ann', 'age': 30}]
+    assert db.select('test', {'id': 2, 'age': 31}) == []
+    assert db.select('test', {'id': 9}) == []
+    assert len(db.select('test', {'age': 30})) == 2
+    # Several non-indexed conditions are checked together
+    assert db.select('test', {'name': 'Ann', 'age': 30}) == [{'id': 2, 'name': 'Ann', 'age': 30}]
+
+# ---------------- Test: Range Queries ----------------
+def test_range_select(db):
+    """
+    Range conditions give the same rows with and without a sorted index.
+    """
+    db.create_table('test', [('id', 'int'), ('age', 'int'), ('dob', 'date')], 'id')
+    for i, age in enumerate([40, 25, 31, 25, 60], start=1):
+        db.insert('test', {'id': i, 'age': age, 'dob': f'2000-01-{i:02d}'})
+    db.insert('test', {'id': 6})          # Missing values never match a range
+
+    def ids(where):
+        return [row['id'] for row in db.select('test', where)]
+
+    for _ in range(2):
+        assert ids({'age': ('>=', 31)}) == [1, 3, 5]
+        assert ids({'age': ('<', 31)}) == [2, 4]
+        assert ids({'age': ('BETWEEN', 25, 40), 'id': ('>', 2)}) == [3, 4]
+        assert ids({'dob': ('<=', '2000-01-02')}) == [1, 2]
+        assert ids({'dob': '2000-01-03'}) == [3]
+        db.create_sorted_index('test', 'age')
+        db.create_sorted_index('test', 'dob')
+
+    db.update('test', {'id': 1}, {'age': 20})
+    db.delete('test', {'id': 2})
+    assert ids({'age': ('<', 30)}) == [1, 4]
+    with pytest.raises(ValueError, match="Invalid condition"):
+        db.select('test', {'age': ('!=', 1)})
+    with pytest.raises(ValueError, match="Invalid condition"):
+        db.select('test', {'age': ('>', None)})
+
+# ---------------- Test: Int Column Scans ----------------
+def test_int_column_scan(db):
+    """
+    Scans over int columns skip missing values and deleted rows
+    (these run through numpy arrays when numpy is installed).
+    """
+    db.create_table('test', [('id', 'int'), ('score', 'int')], 'id')
+    for i in range(1, 101):
+        db.insert('test', {'id': i, 'score': i % 10} if i % 7 else {'id': i})
+    db.delete('test', {'id': 10})
+    db.update('test', {'id': 20}, {'score': 99})
+
+    def ids(where):
+        return [row['id'] for row in db.select('test', where)]
+
+    assert ids({'score': 0}) == [30, 40, 50, 60, 80, 90, 100]
+    assert ids({'score': ('>', 8)}) == [9, 19, 20, 29, 39, 59, 69, 79, 89, 99]
+    assert ids({'score': ('BETWEEN', 0, 1), 'id': ('<', 30)}) == [1, 11]
+    assert ids({'score': None}) == [7, 14, 21, 28, 35, 42, 49, 56, 63, 70, 77, 84, 91, 98]
+    # Few rows from the primary key index, then filtered on score
+    assert ids({'id': 7, 'score': ('>=', 0)}) == []
+    assert db.select('test', {'id': 14}) == [{'id': 14, 'score': None}]
+    db.compact()
+    assert SimpleRDBMS('test_database.json').select('test', {'id': 20}) == [{'id': 20, 'score': 99}]
+
+# ---------------- Test: Count & Max PK ----------------
+def test_count_and_max_pk(db):
+    """
+    count() and max_pk() follow inserts and deletes.
+    """
+    db.create_table('test', [('id', 'int')], 'id')
+    assert db.count('test') == 0
+    assert db.max_pk('test') is None
+    for i in (3, 1, 2):
+        db.insert('test', {'id': i})
+    assert db.max_pk('test') == 3
+    db.insert('test', {'id': 5})
+    assert db.max_pk('test') == 5
+    db.delete('test', {'id': 5})
+    assert db.count('test') == 3
+    assert db.max_pk('test') == 3
+
+# ---------------- Test: Index Maintenance ----------------
+def test_delete_keeps_indexes(db):
+    """
+    Deleting a row must keep PK and unique lookups pointing at the right rows.
+    """
+    db.create_table('test', [('id', 'int'), ('name', 'str')], 'id', uniques=['name'])
+    for i, name in enumerate(['a', 'b', 'c'], start=1):
+        db.insert('test', {'id': i, 'name': name})
+    db.delete('test', {'id': 1})
+    db.update('test', {'id': 3}, {'name': 'z'})
+    assert db.select('test') == [{'id': 2, 'name': 'b'}, {'id': 3, 'name': 'z'}]
+    with pytest.raises(ValueError, match="Duplicate value in unique column"):
+        db.insert('test', {'id': 4, 'name': 'b'})
+    db.insert('test', {'id': 1, 'name': 'c'})
+    with pytest.raises(ValueError, match="Row not found"):
+        db.delete('test', {'id': 5})
+
+def test_delete_tombstones(db):
+    """
+    Deleted rows stay out of scans, new indexes and snapshots.
+    """
+    db.create_table('test', [('id', 'int'), ('tag', 'str')], 'id')
+    for i in range(1, 5):
+        db.insert('test', {'id': i, 'tag': 'even' if i % 2 == 0 else 'odd'})
+    db.delete('test', {'id': 2})
+    assert db.count('test') == 3
+    assert db.select('test', {'tag': 'even'}) == [{'id': 4, 'tag': 'even'}]
+    db.create_index('test', 'tag')
+    assert db.select('test', {'tag': 'even'}) == [{'id': 4, 'tag': 'even'}]
+    db.compact()
+    new_db = SimpleRDBMS('test_database.json')
+    assert [row['id'] for row in new_db.select('test')] == [1, 3, 4]
+
 # ---------------- Test: Join ----------------
 def test_join(db):
     """
@@ -75,6 +219,23 @@ def test_join(db):
     assert len(results) == 1
     assert results[0]['orders_order_id'] == 100
 
+def test_join_unindexed(db):
+    """
+    Join on a column that is not indexed in either table.
+    """
+    db.create_table('users', [('uid', 'int'), ('city', 'str')], 'uid')
+    db.create_table('shops', [('sid', 'int'), ('city', 'str')], 'sid')
+    db.insert('users', {'uid': 1, 'city': 'Nairobi'})
+    db.insert('users', {'uid': 2, 'city': 'Mombasa'})
+    for sid, city in ((10, 'Mombasa'), (11, 'Nairobi'), (12, 'Kisumu')):
+        db.insert('shops', {'sid': sid, 'city': city})
+    # Rows follow the first table's order even when it is the smaller side
+    results = db.join('users', 'shops', 'city')
+    assert [(r['uid'], r['shops_sid']) for r in results] == [(1, 11), (2, 10)]
+    db.insert('shops', {'sid': 13, 'city': 'Nairobi'})
+    results = db.join('users', 'shops', 'city')
+    assert [(r['uid'], r['shops_sid']) for r in results] == [(1, 11), (1, 13), (2, 10)]
+
 # ---------------- Test: Persistence ----------------
 def test_persistence(db):
     """
@@ -84,3 +245,138 @@ def test_persistence(db):
     db.insert('test', {'id': 1})
     new_db = SimpleRDBMS('test_database.json')
     assert new_db.select('test') == [{'id': 1}]
+
+# ---------------- Test: Date Primary Key ----------------
+def test_date_primary_key(db):
+    """
+    Update and delete by a date key, given as a date or an ISO string, and replay them.
+    """
+    db.create_table('ev', [('d', 'date'), ('name', 'str')], 'd')
+    db.insert('ev', {'d': '2000-01-01', 'name': 'a'})
+    db.insert('ev', {'d': '2000-01-02', 'name': 'b'})
+    db.update('ev', {'d': date(2000, 1, 1)}, {'name': 'c'})
+    db.delete('ev', {'d': '2000-01-02'})
+    expected = [{'d': date(2000, 1, 1), 'name': 'c'}]
+    assert db.select('ev') == expected
+    assert SimpleRDBMS('test_database.json').select('ev') == expected
+
+# ---------------- Test: Stale Instance Close ----------------
+def test_stale_close(db):
+    """
+    Closing an instance that missed another instance's writes keeps those writes.
+    """
+    db.create_table('test', [('id', 'int')], 'id')
+    other = SimpleRDBMS('test_database.json')
+    other.insert('test', {'id': 1})
+    other.insert('test', {'id': 2})
+    other.close()
+    db.close()
+    assert SimpleRDBMS('test_database.json').count('test') == 2
+
+# ---------------- Test: Torn Log Write ----------------
+def test_torn_wal_tail(db):
+    """
+    A half-written last log line is dropped on load and later writes still replay.
+    """
+    db.create_table('test', [('id', 'int')], 'id')
+    db.insert('test', {'id': 1})
+    with open('test_database.json.wal', 'ab') as f:
+        f.write(b'{"lsn":3,"op":"ins')
+    reopened = SimpleRDBMS('test_database.json')
+    assert reopened.count('test') == 1
+    reopened.insert('test', {'id': 2})
+    assert SimpleRDBMS('test_database.json').count('test') == 2
+
+# ---------------- Test: Group Commit ----------------
+def test_group_commit(db):
+    """
+    Buffered log lines reach the file in groups, on a timer, or on close.
+    """
+    db.close()
+    # No timer here, so only the group size decides when lines are written
+    grouped = SimpleRDBMS('test_database.json', flush_every=3)
+    grouped.create_table('test', [('id', 'int')], 'id')
+    grouped.insert('test', {'id': 1})
+    assert os.path.getsize('test_database.json.wal') == 0
+    grouped.insert('test', {'id': 2})                      # Third record: group is written
+    assert SimpleRDBMS('test_database.json').count('test') == 2
+    grouped.insert('test', {'id': 3})
+    assert SimpleRDBMS('test_database.json').count('test') == 2
+    grouped.close()
+    assert SimpleRDBMS('test_database.json').count('test') == 3
+
+    # A partial group is flushed by the timer
+    timed = SimpleRDBMS('test_database.json', flush_every=100, flush_interval=0.01)
+    timed.insert('test', {'id': 4})
+    timer = timed._timer
+    if timer is not None:                                  # (None if it already fired)
+        timer.join()
+    assert SimpleRDBMS('test_database.json').count('test') == 4
+    timed.close()
+
+# ---------------- Test: Threaded Writes ----------------
+def test_threaded_writes(db, monkeypatch):
+    """
+    Concurrent inserts, deletes and compactions leave a log that replays cleanly.
+    """
+    monkeypatch.setattr(SimpleRDBMS, 'WAL_COMPACT_BYTES', 4096)    # Compact mid-burst
+    interval = sys.getswitchinterval()
+    db.create_table('test', [('id', 'int'), ('n', 'int')], 'id')
+
+    def insert_all():
+        for i in range(300):
+            db.insert('test', {'id': i, 'n': i})
+
+    def delete_evens():
+        # Each delete is retried until the inserting thread has added the row
+        for i in range(0, 300, 2):
+            while True:
+                try:
+                    db.delete('test', {'id': i})
+                    break
+                except ValueError:
+                    if not inserter.is_alive():
+                        return
+
+    inserter = threading.Thread(target=insert_all)
+    threads = [inserter, threading.Thread(target=delete_evens)]
+    sys.setswitchinterval(1e-5)                                    # Switch threads often
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(interval)
+    expected = list(range(1, 300, 2))
+    assert [row['id'] for row in db.select('test')] == expected
+    assert [row['id'] for row in SimpleRDBMS('test_database.json').select('test')] == expected
+
+# ---------------- Test: Compaction ----------------
+def test_compaction(db):
+    """
+    Verify compaction folds the write-ahead log into the snapshot.
+    """
+    db.create_table('test', [('id', 'int'), ('dob', 'date')], 'id')
+    db.insert('test', {'id': 1, 'dob': '2000-01-01'})
+    db.insert('test', {'id': 2, 'dob': '2001-01-01'})
+    db.compact()
+    assert os.path.getsize('test_database.json.wal') == 0
+    db.delete('test', {'id': 1})
+    new_db = SimpleRDBMS('test_database.json')
+    assert new_db.select('test') == [{'id': 2, 'dob': date(2001, 1, 1)}]
+
+# ---------------- Test: Close Compacts ----------------
+def test_close_compacts(db):
+    """
+    Verify close() folds pending log lines into the snapshot and empties the log.
+    """
+    db.create_table('test', [('id', 'int')], 'id')
+    db.insert('test', {'id': 1})
+    db.close()
+    assert os.path.getsize('test_database.json.wal') == 0
+    with pytest.raises(ValueError, match="Database is closed"):
+        db.insert('test', {'id': 2})
+    new_db = SimpleRDBMS('test_database.json')
+    assert new_db.select('test') == [{'id': 1}]
+    new_db.close()
@@ -0,0 +1,97 @@
+import pytest
+import os                  # For cleaning up test JSON file after tests
+from database import SimpleRDBMS
+from parser import parse_command, tokenize
+
+# ---------------- Fixture ----------------
+@pytest.fixture
+def db():
+    """
+    Creates a temporary database with a users table for parser tests.
+    Cleans up the JSON file and its write-ahead log after the test.
+    """
+    test_db = SimpleRDBMS('test_parser.json')
+    parse_command(test_db, "CREATE TABLE users (id int PRIMARY KEY, name str UNIQUE);")
+    yield test_db
+    test_db.close()
+    for path in ('test_parser.json', 'test_parser.json.wal'):
+        if os.path.exists(path):
+            os.remove(path)
+
+# ---------------- Test: Tokenizer ----------------
+def test_tokenize():
+    """
+    Quoted strings keep commas and '=' signs; keywords are case-insensitive.
+    """
+    tokens = list(tokenize("insert INTO t (a) values ('x, y=1', -3);"))
+    assert tokens == [
+        ('KEYWORD', 'INSERT'), ('KEYWORD', 'INTO'), ('IDENT', 't'),
+        ('PUNCT', '('), ('IDENT', 'a'), ('PUNCT', ')'), ('KEYWORD', 'VALUES'),
+        ('PUNCT', '('), ('STRING', 'x, y=1'), ('PUNCT', ','), ('NUMBER', '-3'),
+        ('PUNCT', ')'), ('PUNCT', ';'), ('END', ''),
+    ]
+    assert list(tokenize("SeLeCt Select where Wherever")) == [
+        ('KEYWORD', 'SELECT'), ('KEYWORD', 'SELECT'), ('KEYWORD', 'WHERE'),
+        ('IDENT', 'Wherever'), ('END', ''),
+    ]
+
+# ---------------- Test: CRUD Commands ----------------
+def test_crud_commands(db):
+    """
+    Run insert, select, update and delete through the parser.
+    """
+    parse_command(db, "INSERT INTO users (id, name) VALUES (1, 'Sam, Jr');")
+    parse_command(db, "INSERT INTO users (id, name) VALUES (2, 'Ann');")
+    assert parse_command(db, "SELECT * FROM users WHERE name='Sam, Jr';") == [{'id': 1, 'name': 'Sam, Jr'}]
+    parse_command(db, "UPDATE users SET name='It''s me' WHERE id=1;")
+    assert parse_command(db, "select * from users where id=1 and name='It''s me'") == [{'id': 1, 'name': "It's me"}]
+    parse_command(db, "DELETE FROM users WHERE id=1;")
+    assert parse_command(db, "SELECT * FROM users;") == [{'id': 2, 'name': 'Ann'}]
+    # Unquoted values that spell a keyword are kept as typed
+    parse_command(db, "INSERT INTO users (id, name) VALUES (3, Create);")
+    parse_command(db, "UPDATE users SET name=Update WHERE id=2;")
+    assert parse_command(db, "SELECT * FROM users WHERE id BETWEEN 2 AND 3;") == [
+        {'id': 2, 'name': 'Update'}, {'id': 3, 'name': 'Create'}]
+
+# ---------------- Test: Range Conditions ----------------
+def test_range_conditions(db):
+    """
+    WHERE supports <, <=, >, >= and BETWEEN ... AND ...
+    """
+    for i in range(1, 6):
+        parse_command(db, f"INSERT INTO users (id, name) VALUES ({i}, 'u{i}');")
+    rows = parse_command(db, "SELECT * FROM users WHERE id>=2 AND name<'u4';")
+    assert [row['id'] for row in rows] == [2, 3]
+    rows = parse_command(db, "SELECT * FROM users WHERE id > 4")
+    assert [row['id'] for row in rows] == [5]
+    rows = parse_command(db, "SELECT * FROM users WHERE id BETWEEN 4 AND 9 AND name='u5';")
+    assert [row['id'] for row in rows] == [5]
+    with pytest.raises(ValueError, match="Only one condition per column"):
+        parse_command(db, "SELECT * FROM users WHERE id>=2 AND id<4;")
+
+# ---------------- Test: Join Command ----------------
+def test_join_command(db):
+    """
+    JOIN two tables on a shared column.
+    """
+    parse_command(db, "CREATE TABLE orders (order_id int PRIMARY KEY, id int);")
+    parse_command(db, "INSERT INTO users (id, name) VALUES (1, 'Sam');")
+    parse_command(db, "INSERT INTO orders (order_id, id) VALUES (100, 1);")
+    results = parse_command(db, "JOIN users orders ON id;")
+    assert results == [{'id': 1, 'name': 'Sam', 'orders_order_id': 100, 'orders_id': 1}]
+
+# ---------------- Test: Syntax Errors ----------------
+def test_syntax_errors(db):
+    """
+    Bad commands raise ValueError with a helpful message.
+    """
+    with pytest.raises(ValueError, match="Unknown command"):
+        parse_command(db, "DROP TABLE users;")
+    with pytest.raises(ValueError, match="Invalid INSERT syntax"):
+        parse_command(db, "INSERT INTO users (id, name) VALUES (1, 'Sam'")
+    with pytest.raises(ValueError, match="Unterminated string"):
+        parse_command(db, "SELECT * FROM users WHERE name='Sam;")
+    with pytest.raises(ValueError, match="DELETE requires WHERE clause"):
+        parse_command(db, "DELETE FROM users;")
+    with pytest.raises(ValueError, match="PRIMARY KEY is required"):
+        parse_command(db, "CREATE TABLE t (id int);")